@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import os
+import re
+import shutil
+import subprocess
+import sys
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+try:
+    import hyperscan
+except ImportError:  # optional accelerator; `re` is used otherwise
+    hyperscan = None
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Files we are allowed to mention StegID in (scanner + receipts only)
+ALLOWLIST_PATHS = {
+    "scripts/_impl/scan_no_stegid.py",
+    "src/sv_receipts.py",
+}
+
+SCAN_EXTS = {".py", ".yml", ".yaml", ".toml", ".md", ".txt", ".json", ".cfg", ".ini"}
+
+# Anything larger is a generated blob or asset, not a place imports live.
+MAX_SCAN_BYTES = 2 * 1024 * 1024
+
+# Extension-less files that can still declare or install dependencies.
+SCAN_BASENAMES = {"Dockerfile", "Makefile", "Pipfile"}
+
+BANNED_PATTERNS: Tuple[Tuple[str, re.Pattern], ...] = (
+    (
+        "stegid_import",
+        re.compile(r"^\s*(from|import)\s+stegid\b", re.IGNORECASE),
+    ),
+    (
+        "stegid_repo",
+        re.compile(r"stegverse-labs/stegid(\.git)?", re.IGNORECASE),
+    ),
+)
+
+
+def _buffer_pattern(pattern: re.Pattern) -> bytes:
+    # Whole-buffer scans run with MULTILINE, where \s would also match "\n"
+    # and let a pattern span lines; the line-based engines never do that.
+    return pattern.pattern.replace(r"\s", r"[^\S\n]").encode()
+
+
+# All banned patterns fused into one alternation; the group name is the label.
+MASTER = re.compile(
+    b"|".join(
+        b"(?P<%s>%s)" % (label.encode(), _buffer_pattern(pattern))
+        for label, pattern in BANNED_PATTERNS
+    ),
+    re.IGNORECASE | re.MULTILINE,
+)
+
+# Every banned pattern contains this token; files without it cannot match.
+PREFILTER = re.compile(rb"stegid", re.IGNORECASE)
+
+
+def _compile_hyperscan():
+    db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    db.compile(
+        expressions=[_buffer_pattern(pattern) for _, pattern in BANNED_PATTERNS],
+        ids=list(range(len(BANNED_PATTERNS))),
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_MULTILINE] * len(BANNED_PATTERNS),
+    )
+    return db
+
+
+HS_DB = _compile_hyperscan() if hyperscan is not None else None
+
+
+def git_ls_files() -> Iterable[str]:
+    out = subprocess.check_output(["git", "ls-files"], text=True)
+    return (line.strip() for line in out.splitlines())
+
+
+def should_scan(path: Path) -> bool:
+    # Decided from the name alone, so binaries and blobs are never opened.
+    if path.suffix.lower() not in SCAN_EXTS and path.name not in SCAN_BASENAMES:
+        return False
+    if path.as_posix() in ALLOWLIST_PATHS:
+        return False
+    return True
+
+
+def _label_lines(records: Iterable[Tuple[bytes, int, bytes]]) -> List[str]:
+    # External tools only say a line matched; label it with the Python patterns.
+    violations = []
+    for rel, line_no, line in records:
+        for label in dict.fromkeys(m.lastgroup for m in MASTER.finditer(line)):
+            violations.append(
+                f"- {rel.decode('utf-8', errors='replace')}:{line_no} "
+                f"[{label}] {line.decode('utf-8', errors='replace').strip()}"
+            )
+    return violations
+
+
+def ripgrep_violations() -> Optional[List[str]]:
+    """
+    Run the scan through ripgrep when it is on PATH.
+
+    Returns None when `rg` is missing or fails so the caller can fall back.
+    """
+    rg = shutil.which("rg")
+    if rg is None:
+        return None
+
+    cmd = [
+        rg, "--line-number", "--with-filename", "--no-heading", "--null",
+        "--color", "never", "--ignore-case", "--hidden",
+        "--max-filesize", str(MAX_SCAN_BYTES),
+    ]
+    for _, pattern in BANNED_PATTERNS:
+        cmd += ["-e", pattern.pattern]
+    cmd += ["--iglob", "!.git"]
+    cmd += [arg for ext in sorted(SCAN_EXTS) for arg in ("--iglob", f"*{ext}")]
+    cmd += [arg for name in sorted(SCAN_BASENAMES) for arg in ("--glob", name)]
+    cmd += [arg for rel in sorted(ALLOWLIST_PATHS) for arg in ("--glob", f"!/{rel}")]
+
+    try:
+        proc = subprocess.run(cmd, capture_output=True)
+    except OSError:
+        return None
+    if proc.returncode == 1:
+        return []
+    if proc.returncode != 0:
+        return None
+
+    records = []
+    for record in proc.stdout.split(b"\n"):
+        if not record:
+            continue
+        rel, rest = record.split(b"\0", 1)
+        line_no, line = rest.split(b":", 1)
+        records.append((rel, int(line_no), line))
+    # rg searches in parallel; keep the report in path/line order.
+    records.sort(key=lambda r: (r[0], r[1]))
+    return _label_lines(records)
+
+
+def _oversized(files: Iterable[str]) -> List[str]:
+    """Return the files larger than MAX_SCAN_BYTES."""
+    big = []
+    for rel in files:
+        try:
+            if os.stat(rel).st_size > MAX_SCAN_BYTES:
+                big.append(rel)
+        except OSError:
+            continue
+    return big
+
+
+def git_grep_violations() -> Optional[List[str]]:
+    """
+    Run the scan through `git grep` (C, multi-threaded) over tracked files.
+
+    Returns None when git grep is unavailable so the caller can fall back to
+    the in-process scanner.
+    """
+    cmd = ["git", "grep", "-n", "-z", "-I", "-i", "-E"]
+    for _, pattern in BANNED_PATTERNS:
+        cmd += ["-e", pattern.pattern]
+    cmd.append("--")
+    cmd += [f":(icase)*{ext}" for ext in sorted(SCAN_EXTS)]
+    cmd += [f":(glob)**/{name}" for name in sorted(SCAN_BASENAMES)]
+    cmd += [f":(exclude){rel}" for rel in sorted(ALLOWLIST_PATHS)]
+
+    # git grep has no size limit; exclude what the other engines skip.
+    try:
+        oversized = _oversized(rel for rel in git_ls_files() if should_scan(Path(rel)))
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    cmd += [f":(exclude,literal){rel}" for rel in oversized]
+
+    try:
+        proc = subprocess.run(cmd, capture_output=True)
+    except OSError:
+        return None
+    if proc.returncode == 1:
+        return []
+    if proc.returncode != 0:
+        return None
+
+    records = []
+    for record in proc.stdout.split(b"\n"):
+        if not record:
+            continue
+        rel, line_no, line = record.split(b"\0", 2)
+        records.append((rel, int(line_no), line))
+    return _label_lines(records)
+
+
+def _find_hits(data) -> List[Tuple[int, str]]:
+    """Return (end_offset, label) for every banned-pattern match in `data`."""
+    if HS_DB is not None:
+        hits: List[Tuple[int, str]] = []
+
+        def on_match(pattern_id, _from, to, _flags, _ctx):
+            hits.append((to, BANNED_PATTERNS[pattern_id][0]))
+
+        HS_DB.scan(data, match_event_handler=on_match)
+        return hits
+    return [(m.end(), m.lastgroup) for m in MASTER.finditer(data)]
+
+
+def _line_starts(data) -> List[int]:
+    starts = [0]
+    i = data.find(b"\n")
+    while i != -1:
+        starts.append(i + 1)
+        i = data.find(b"\n", i + 1)
+    return starts
+
+
+def scan_file(rel: str) -> List[str]:
+    # Banned tokens are pure ASCII, so scan raw bytes and only decode the
+    # lines we report. One fd: open, fstat for the size cap, one read.
+    try:
+        fd = os.open(rel, os.O_RDONLY)
+    except OSError:
+        return []
+    try:
+        size = os.fstat(fd).st_size
+        if size == 0 or size > MAX_SCAN_BYTES:
+            return []
+        data = os.read(fd, size)
+    except OSError:
+        return []
+    finally:
+        os.close(fd)
+    return _scan_buffer(rel, data)
+
+
+def _scan_buffer(rel: str, data) -> List[str]:
+    if not PREFILTER.search(data):
+        return []
+
+    hits = _find_hits(data)
+    if not hits:
+        return []
+
+    starts = _line_starts(data)
+    starts.append(len(data) + 1)
+    violations = []
+    seen = set()
+    for end, label in sorted(hits):
+        # Matches stay within one line, so the last matched byte locates it.
+        idx = bisect_right(starts, end - 1)
+        if (idx, label) in seen:
+            continue
+        seen.add((idx, label))
+        line = data[starts[idx - 1]:starts[idx] - 1].decode("utf-8", errors="replace")
+        violations.append(f"- {rel}:{idx} [{label}] {line.strip()}")
+    return violations
+
+
+def python_violations() -> List[str]:
+    violations = []
+    files = [rel for rel in git_ls_files() if should_scan(Path(rel))]
+
+    # File reads and the regex/Hyperscan scan both release the GIL.
+    workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        for file_violations in ex.map(scan_file, files):
+            violations.extend(file_violations)
+    return violations
+
+
+def main() -> int:
+    # Fastest available engine first: ripgrep, git grep, then in-process.
+    violations = ripgrep_violations()
+    if violations is None:
+        violations = git_grep_violations()
+    if violations is None:
+        violations = python_violations()
+
+    if violations:
+        # One write for the whole report; hit-heavy runs otherwise cost a
+        # syscall per line on unbuffered CI stdout.
+        sys.stdout.write(
+            "❌ ERROR: Forbidden StegID reference detected.\n\n"
+            "These references must not exist in this repo:\n\n"
+            + "\n".join(violations)
+            + "\n\nFix: remove the reference or explicitly allowlist the path.\n"
+        )
+        return 2
+
+    print("✅ Scan passed: no forbidden StegID references found.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,14 +1,14 @@
 #!/usr/bin/env python3
 import json
 import os
-import datetime
+import time
 
 agent = os.environ.get("SV_AGENT", "unknown")
 
 receipt = {
     "issuer": "local",
     "agent": agent,
-    "issued_at": datetime.datetime.utcnow().isoformat() + "Z",
+    "issued_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
     "verified": True,
     "verifier": "local",
 }
@@ -1,10 +1,15 @@
-import base64
 import hashlib
 import json
 import os
+from binascii import a2b_base64, b2a_base64
 from datetime import datetime, timedelta, timezone
 
-from nacl.signing import SigningKey
+try:
+    # OpenSSL-backed Ed25519; noticeably cheaper per sign than PyNaCl.
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+except ImportError:  # pragma: no cover - fall back to libsodium
+    Ed25519PrivateKey = None
+    from nacl.signing import SigningKey
 
 
 def utc_now() -> datetime:
@@ -12,18 +17,29 @@ def utc_now() -> datetime:
 
 
 def iso(dt: datetime) -> str:
-    return dt.astimezone(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+    # `dt` is always UTC-aware (see utc_now); strftime also drops microseconds.
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
 def canonical_payload(warrant: dict) -> bytes:
     # Signature covers everything except signature itself.
-    w = dict(warrant)
-    w.pop("signature", None)
+    w = {k: v for k, v in warrant.items() if k != "signature"}
+    # Stdlib json is the canonical (signed) form. orjson is not used here: it
+    # formats some floats differently (1e16 vs 1e+16, 1e-7 vs 1e-07) and
+    # NaN as null, so verifiers using stdlib json would reject the signature.
     return json.dumps(w, separators=(",", ":"), sort_keys=True).encode("utf-8")
 
 
 def sha256_hex(data: bytes) -> str:
-    return hashlib.sha256(data).hexdigest()
+    # Informational digest for CI logs; the signature is what binds the payload.
+    return hashlib.sha256(data, usedforsecurity=False).hexdigest()
+
+
+def sign_ed25519(priv: bytes, payload: bytes) -> bytes:
+    # Ed25519 is deterministic, so both backends emit identical signatures.
+    if Ed25519PrivateKey is not None:
+        return Ed25519PrivateKey.from_private_bytes(priv).sign(payload)
+    return SigningKey(priv).sign(payload).signature
 
 
 def main() -> None:
@@ -87,19 +103,21 @@ def main() -> None:
 
     payload = canonical_payload(warrant)
 
-    priv = base64.b64decode(priv_b64)
-    sk = SigningKey(priv)
-    sig = sk.sign(payload).signature
-    sig_b64 = base64.b64encode(sig).decode("utf-8")
+    priv = a2b_base64(priv_b64)
+    sig = sign_ed25519(priv, payload)
+    sig_b64 = b2a_base64(sig, newline=False).decode("utf-8")
 
-    warrant["signature"] = {
+    signature = {
         "alg": "ed25519",
         "public_key_id": public_key_id,
         "sig_b64": sig_b64
     }
 
-    out = json.dumps(warrant, indent=2, sort_keys=True)
-    print(out)
+    # Splice the signature onto the already-serialized payload instead of
+    # encoding the whole warrant a second time. Output is compact JSON.
+    sig_json = json.dumps(signature, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    out = payload[:-1] + b',"signature":' + sig_json + b"}"
+    print(out.decode("utf-8"))
 
     # For CI: optionally emit hash line
     print(f"\n# warrant_payload_sha256={sha256_hex(payload)}")
@@ -0,0 +1,99 @@
+"""
+Shared JSON helpers: orjson when installed, stdlib json otherwise.
+
+`dumps` always returns UTF-8 bytes with non-ASCII left unescaped (the
+`ensure_ascii=False` behaviour the indexers relied on), so callers write it
+with `Path.write_bytes` or a binary file handle.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Callable, List
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+
+def dumps(obj: Any, *, indent: bool = False, sort: bool = False) -> bytes:
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, option=option)
+        except orjson.JSONEncodeError:
+            pass  # e.g. ints wider than 64 bits; the stdlib encoder copes
+
+    if indent:
+        text = json.dumps(obj, ensure_ascii=False, indent=2, sort_keys=sort)
+    else:
+        text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"), sort_keys=sort)
+    return text.encode("utf-8")
+
+
+if orjson is not None:
+    loads = orjson.loads
+    # Subclass of json.JSONDecodeError, so either can be caught.
+    JSONDecodeError = orjson.JSONDecodeError
+else:  # pragma: no cover
+    loads = json.loads
+    JSONDecodeError = json.JSONDecodeError
+
+
+_WS = re.compile(r"[ \t\r\n]*")
+_DECODER = json.JSONDecoder()
+
+
+def loads_many(text: str, fallback: Callable[[str], Any]) -> List[Any]:
+    """
+    Parse the JSON objects in newline-delimited JSON text.
+
+    Each line is first tried whole with the fast `loads`. If that fails, an
+    object is decoded in place with `raw_decode`, which accepts objects
+    pretty-printed across several lines; it is kept only if the rest of its
+    last line is blank. Anything else (prose, numbered lists, bare scalars)
+    is passed, one whole stripped line at a time, to `fallback`, and its
+    result is kept in order.
+    """
+    out: List[Any] = []
+    i, n = 0, len(text)
+    while True:
+        i = _WS.match(text, i).end()
+        if i >= n:
+            return out
+        j = text.find("\n", i)
+        if j == -1:
+            j = n
+        try:
+            value = loads(text[i:j])
+        except JSONDecodeError:
+            value = None
+        if isinstance(value, dict):
+            out.append(value)
+            i = j
+            continue
+        try:
+            value, end = _DECODER.raw_decode(text, i)
+        except json.JSONDecodeError:
+            value, end = None, i
+        if isinstance(value, dict):
+            k = text.find("\n", end)
+            if k == -1:
+                k = n
+            if not text[end:k].strip():
+                out.append(value)
+                i = k
+                continue
+        line = text[i:j].strip()
+        if line:
+            out.append(fallback(line))
+        i = j
+
+
+__all__ = ["dumps", "loads", "loads_many", "JSONDecodeError"]
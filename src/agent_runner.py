@@ -1,17 +1,23 @@
 import argparse
+import functools
 import importlib
-import json
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, List, Tuple
 
+from . import _json
 from .models import ActionIntent
 from .warrant_verify import verify_warrant
 
 OUT_DIR = Path("out")
-OUT_DIR.mkdir(parents=True, exist_ok=True)
+if not OUT_DIR.is_dir():
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+
+# agent name -> resolved entrypoint, so repeat runs skip the candidate walk
+_ENTRY_CACHE: Dict[str, Callable[..., Any]] = {}
 
 
 @dataclass
@@ -21,16 +27,16 @@ class RunContext:
     metadata: Dict[str, Any]
 
 
-def _agent_module_candidates(agent: str) -> list[str]:
+@functools.lru_cache(maxsize=256)
+def _agent_module_candidates(agent: str) -> Tuple[str, ...]:
     normalized = agent.replace("-", "_")
     lowerish = normalized.lower()
 
-    stripped = normalized
-    while stripped and stripped[0].isdigit():
-        stripped = stripped[1:]
-    stripped = stripped.strip("_") or normalized
+    stripped = normalized.lstrip("0123456789").strip("_") or normalized
 
-    return [
+    # Order matters (first importable wins); dict.fromkeys drops the repeats
+    # that appear whenever the name is already lowercase or has no digit prefix.
+    return tuple(dict.fromkeys((
         f"src.agents.{normalized}",
         f"src.agents.{lowerish}",
         f"src.agents.{normalized}.main",
@@ -39,22 +45,28 @@ def _agent_module_candidates(agent: str) -> list[str]:
         f"src.agents.{stripped}.main",
         f"src.agents.{stripped.lower()}",
         f"src.agents.{stripped.lower()}.main",
-    ]
+    )))
 
 
 def _resolve_agent_entrypoint(agent: str) -> Callable[[RunContext], Any]:
+    cached = _ENTRY_CACHE.get(agent)
+    if cached is not None:
+        return cached
+
+    candidates = _agent_module_candidates(agent)
     last_err = None
-    for mod_name in _agent_module_candidates(agent):
+    for mod_name in candidates:
         try:
             mod = importlib.import_module(mod_name)
-            if hasattr(mod, "run") and callable(getattr(mod, "run")):
-                return getattr(mod, "run")
-            if hasattr(mod, "main") and callable(getattr(mod, "main")):
-                return getattr(mod, "main")
+            for attr in ("run", "main"):
+                entry = getattr(mod, attr, None)
+                if callable(entry):
+                    _ENTRY_CACHE[agent] = entry
+                    return entry
         except Exception as e:
             last_err = e
 
-    tried = "\n".join([f"  - {m}" for m in _agent_module_candidates(agent)])
+    tried = "\n".join([f"  - {m}" for m in candidates])
     raise RuntimeError(
         f"Could not import/run agent '{agent}'. Tried modules:\n{tried}\n"
         f"Last error: {last_err}\n"
@@ -63,8 +75,9 @@ def _resolve_agent_entrypoint(agent: str) -> Callable[[RunContext], Any]:
 
 
 def _write_run_artifact(out_dir: Path, agent: str, warrant: Dict[str, Any], result: Any) -> Path:
+    now = datetime.now(timezone.utc)
     payload = {
-        "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "timestamp": now.isoformat().replace("+00:00", "Z"),
         "agent": agent,
         "warrant_id": warrant.get("warrant_id"),
         "issuer": warrant.get("issuer"),
@@ -72,65 +85,81 @@ def _write_run_artifact(out_dir: Path, agent: str, warrant: Dict[str, Any], resu
         "claims": warrant.get("claims", {}),
         "result": result,
     }
-    fp = out_dir / f"{agent}__{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.json"
-    fp.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+    stamp = f"{now.year:04d}{now.month:02d}{now.day:02d}T{now.hour:02d}{now.minute:02d}{now.second:02d}Z"
+    fp = out_dir / f"{agent}__{stamp}.json"
+    # Encoded straight to UTF-8 bytes; no intermediate str copy of the result.
+    fp.write_bytes(_json.dumps(payload, indent=True, sort=True))
     return fp
 
 
-def _load_warrant_from_env() -> Dict[str, Any]:
-    raw = os.getenv("STEGVERSE_WARRANT_JSON", "").strip()
+def _load_warrant_from_env(raw: str) -> Dict[str, Any]:
+    raw = raw.strip()
     if not raw:
         raise RuntimeError("Missing STEGVERSE_WARRANT_JSON (Execution Warrant required).")
     try:
-        return json.loads(raw)
+        return _json.loads(raw)
     except Exception as e:
         raise RuntimeError(f"Invalid STEGVERSE_WARRANT_JSON: {e}")
 
 
-def _load_tv_public_key_b64() -> str:
+def _load_tv_public_key_b64(raw: str) -> str:
     # For Sprint 1: simplest path is to pass issuer pubkey via env in CI.
     # Sprint 2: load from TV-exported bundle pinned by hash.
-    pk = os.getenv("TV_WARRANT_ISSUER_PUBKEY_B64", "").strip()
+    pk = raw.strip()
     if not pk:
         raise RuntimeError("Missing TV_WARRANT_ISSUER_PUBKEY_B64.")
     return pk
 
 
+# StegCore enforce_policy once resolved: None = not tried yet, False = not installed.
+_STEGCORE: Any = None
+
+
 def _required_policy_gate(agent: str, warrant: Dict[str, Any]) -> None:
     # Optional StegCore gate hook preserved, but warrant validation is always required.
     # If you have StegCore installed, you can enforce additional policy here.
-    try:
-        from .stegcore_guard import enforce_policy  # type: ignore
-
-        intent = ActionIntent(action="run_agent", target=agent, metadata={"issuer": warrant.get("issuer", "unknown")})
-        decision = enforce_policy(intent=intent, receipt=warrant)
-        verdict = getattr(decision, "verdict", "ALLOW")
-        if verdict != "ALLOW":
-            reason = getattr(decision, "reason", "Policy denied agent run.")
-            raise RuntimeError(f"DENIED_BY_STEGCORE: {verdict} {reason}")
-    except ModuleNotFoundError:
-        # No StegCore in repo: that's fine for Sprint 1.
+    global _STEGCORE
+    if _STEGCORE is False:
         return
+    if _STEGCORE is None:
+        try:
+            from .stegcore_guard import enforce_policy  # type: ignore
+        except ModuleNotFoundError:
+            # No StegCore in repo: that's fine for Sprint 1. Remember it so
+            # later runs in this process skip the failed import.
+            _STEGCORE = False
+            return
+        _STEGCORE = enforce_policy
+
+    intent = ActionIntent(action="run_agent", target=agent, metadata={"issuer": warrant.get("issuer", "unknown")})
+    decision = _STEGCORE(intent=intent, receipt=warrant)
+    verdict = getattr(decision, "verdict", "ALLOW")
+    if verdict != "ALLOW":
+        reason = getattr(decision, "reason", "Policy denied agent run.")
+        raise RuntimeError(f"DENIED_BY_STEGCORE: {verdict} {reason}")
 
 
 def run_agent(agent: str) -> int:
-    mode = os.getenv("STEGVERSE_POLICY_MODE", "strict").strip().lower()
+    # Read the environment through one mapping; helpers take the raw values.
+    env = os.environ
+
+    mode = env.get("STEGVERSE_POLICY_MODE", "strict").strip().lower()
     if mode not in ("strict", "warn", "off"):
         mode = "strict"
 
-    warrant = _load_warrant_from_env()
+    warrant = _load_warrant_from_env(env.get("STEGVERSE_WARRANT_JSON", ""))
 
-    expected_bundle = os.getenv("TV_POLICY_BUNDLE_SHA256", "").strip()
+    expected_bundle = env.get("TV_POLICY_BUNDLE_SHA256", "").strip()
     if not expected_bundle:
         raise RuntimeError("Missing TV_POLICY_BUNDLE_SHA256 (pinning required).")
 
-    repo = os.getenv("GITHUB_REPOSITORY", "").strip() or os.getenv("REPO", "").strip()
-    commit_sha = os.getenv("GITHUB_SHA", "").strip() or os.getenv("COMMIT_SHA", "").strip()
+    repo = env.get("GITHUB_REPOSITORY", "").strip() or env.get("REPO", "").strip()
+    commit_sha = env.get("GITHUB_SHA", "").strip() or env.get("COMMIT_SHA", "").strip()
     if not repo or not commit_sha:
         raise RuntimeError("Missing observed repo/commit (need GITHUB_REPOSITORY and GITHUB_SHA).")
 
-    issuer_pubkey_b64 = _load_tv_public_key_b64()
-    max_ttl = int(os.getenv("TV_WARRANT_MAX_TTL_SECONDS", "900").strip())
+    issuer_pubkey_b64 = _load_tv_public_key_b64(env.get("TV_WARRANT_ISSUER_PUBKEY_B64", ""))
+    max_ttl = int(env.get("TV_WARRANT_MAX_TTL_SECONDS", "900").strip())
 
     decision = verify_warrant(
         warrant=warrant,
@@ -165,10 +194,40 @@ def run_agent(agent: str) -> int:
     return 0
 
 
+def run_agents(agents: List[str]) -> int:
+    """
+    Run several independent agents concurrently.
+
+    Agents are I/O-bound and each writes its own artifact under OUT_DIR, so
+    they share nothing but the warrant. Returns 0 only if every agent succeeded.
+    """
+    if not agents:
+        return 0
+
+    status = 0
+    with ThreadPoolExecutor(max_workers=min(8, len(agents))) as ex:
+        futures = {ex.submit(run_agent, agent): agent for agent in agents}
+        for fut in as_completed(futures):
+            try:
+                rc = fut.result()
+            except Exception as e:
+                print(f"❌ Agent {futures[fut]} failed: {e}")
+                rc = 1
+            status = status or rc
+    return status
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="StegAgents runner")
-    parser.add_argument("--agent", required=True, help="Agent name (e.g., GrantFinder-001)")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--agent", help="Agent name (e.g., GrantFinder-001)")
+    group.add_argument("--agents", help="Comma-separated agent names to run concurrently")
     args = parser.parse_args()
+    if args.agents is not None:
+        agents = [a.strip() for a in args.agents.split(",") if a.strip()]
+        if not agents:
+            parser.error("--agents needs at least one agent name")
+        return run_agents(agents)
     return run_agent(args.agent)
 
 
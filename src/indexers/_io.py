@@ -0,0 +1,245 @@
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, TypeVar
+
+from .. import _json
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Fragment JSONL is packed into chunks of at most this many bytes, one LLM
+# call each; a corpus that fits in a single chunk is still one call.
+CHUNK_BYTES = 8 * 1024
+
+# state file -> (st_mtime_ns, keys); reused until the file changes on disk
+_PROCESSED_CACHE: Dict[Path, Tuple[int, Set[str]]] = {}
+
+
+def indexer_workers(default: int = 8) -> int:
+    """Thread count for per-file LLM calls (env STEGVERSE_INDEXER_CONCURRENCY)."""
+    try:
+        n = int(os.environ.get("STEGVERSE_INDEXER_CONCURRENCY", default))
+    except ValueError:
+        n = default
+    return max(1, n)
+
+
+@functools.lru_cache(maxsize=16)
+def _read_cached(path: str, mtime_ns: int, size: int) -> str:
+    return Path(path).read_text(encoding="utf-8")
+
+
+def read_or_empty(path: Path) -> str:
+    """
+    Return the UTF-8 text of path, or "" if it is missing.
+
+    Sibling indexers run in one process read the same outputs (timeline.json,
+    reports), so contents are cached keyed on (path, st_mtime_ns, st_size);
+    any rewrite of the file changes the key.
+    """
+    try:
+        st = os.stat(path)
+        return _read_cached(os.fspath(path), st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        return ""
+
+
+def walk_files(base: Path, skip_suffixes: FrozenSet[str] = frozenset()) -> Iterator[Tuple[Path, str]]:
+    """
+    Yield (path, rel) for every regular file under base, in the same
+    per-component order as sorted(base.rglob("*")).
+
+    Uses os.scandir so the type check comes from the directory entry rather
+    than an extra stat() per file, and filters suffixes (lowercase, no dot)
+    before any Path is built. Symlinks are not followed.
+    """
+    found = []
+    stack = [(os.fspath(base), "")]
+    while stack:
+        top, prefix = stack.pop()
+        try:
+            it = os.scandir(top)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        with it:
+            for e in it:
+                rel = prefix + e.name
+                if e.is_dir(follow_symlinks=False):
+                    stack.append((e.path, rel + "/"))
+                elif e.is_file(follow_symlinks=False):
+                    if skip_suffixes:
+                        stem, dot, ext = e.name.rpartition(".")
+                        if dot and stem and ext.lower() in skip_suffixes:
+                            continue
+                    found.append((rel, e.path))
+    found.sort(key=lambda item: item[0].split("/"))
+    for rel, p in found:
+        yield Path(p), rel
+
+
+def load_processed(path: Path) -> Set[str]:
+    """
+    Return the set of keys recorded in a processed-files state file.
+
+    The parsed set is cached per path and only re-read when st_mtime_ns
+    changes. Callers must treat the result as read-only.
+    """
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        _PROCESSED_CACHE.pop(path, None)
+        return set()
+    hit = _PROCESSED_CACHE.get(path)
+    if hit is not None and hit[0] == mtime:
+        return hit[1]
+    keys = {line.strip() for line in path.read_text(encoding="utf-8").splitlines() if line.strip()}
+    _PROCESSED_CACHE[path] = (mtime, keys)
+    return keys
+
+
+def append_processed(path: Path, keys: Iterable[str]) -> None:
+    """
+    Record keys in a state file, appending only the ones not already there.
+
+    The file stays one plain key per line, so existing state files keep working.
+    """
+    known = load_processed(path)
+    new = [k for k in dict.fromkeys(keys) if k not in known]
+    if not new:
+        return
+    with path.open("a", encoding="utf-8") as fh:
+        fh.write("\n".join(new) + "\n")
+    known = set(known)
+    known.update(new)
+    _PROCESSED_CACHE[path] = (path.stat().st_mtime_ns, known)
+
+
+def open_append(path: Path) -> int:
+    """Open path as a raw O_APPEND file descriptor for append_jsonl."""
+    return os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+
+def append_jsonl(fd: int, objs: Iterable[Any]) -> None:
+    """
+    Append objs as JSON lines with one unbuffered os.write where possible.
+
+    Lines are encoded straight into one bytearray, so there is no
+    file-object buffer copy. With O_APPEND each write lands at the current end
+    of file.
+    """
+    buf = bytearray()
+    for obj in objs:
+        buf += _json.dumps(obj)
+        buf += b"\n"
+    view = memoryview(buf)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def read_jsonl_chunks(path: Path, chunk_bytes: int) -> Tuple[List[str], int]:
+    """
+    Stream a JSONL file and greedily pack its lines into <= chunk_bytes chunks.
+
+    Returns (chunks, line_count); both are empty if the file is missing. A
+    single line larger than chunk_bytes becomes a chunk of its own.
+    """
+    chunks: List[str] = []
+    buf: List[bytes] = []
+    size = 0
+    count = 0
+    try:
+        fh = path.open("rb")
+    except FileNotFoundError:
+        return chunks, count
+    with fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            count += 1
+            if buf and size + len(line) + 1 > chunk_bytes:
+                chunks.append(b"\n".join(buf).decode("utf-8", errors="replace"))
+                buf, size = [], 0
+            buf.append(line)
+            size += len(line) + 1
+    if buf:
+        chunks.append(b"\n".join(buf).decode("utf-8", errors="replace"))
+    return chunks, count
+
+
+def map_ordered(fn: Callable[[T], R], items: Sequence[T]) -> Iterator[R]:
+    """
+    Yield fn(item) for each item in input order, computed on worker threads.
+
+    If a call raises, or the consumer stops early, calls still queued are
+    cancelled instead of run.
+    """
+    pool = ThreadPoolExecutor(max_workers=max(1, min(indexer_workers(), len(items))))
+    try:
+        futures = [pool.submit(fn, item) for item in items]
+        for fut in futures:
+            yield fut.result()
+    except BaseException:
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
+
+
+def map_reduce(
+    chunks: Sequence[str],
+    map_fn: Callable[[str], str],
+    reduce_fn: Callable[[List[str]], str],
+    single_fn: Optional[Callable[[str], str]] = None,
+) -> str:
+    """
+    Run map_fn over chunks in parallel and combine the outputs with reduce_fn.
+
+    A single chunk goes to single_fn (default map_fn) with no reduce call, so
+    context that only the reduce step needs can still reach that one call.
+    """
+    if len(chunks) == 1:
+        return (single_fn or map_fn)(chunks[0])
+    return reduce_fn(list(map_ordered(map_fn, chunks)))
+
+
+def parse_partials(partials: Iterable[str], tag: str) -> List[Dict[str, Any]]:
+    """Parse map-step LLM outputs, dropping any that are not a JSON object."""
+    parsed = []
+    for content in partials:
+        try:
+            part = _json.loads(content)
+        except _json.JSONDecodeError:
+            part = None
+        if isinstance(part, dict):
+            parsed.append(part)
+        else:
+            print(f"[{tag}] Dropping unparseable partial result.")
+    return parsed
+
+
+def process_and_append(
+    path: Path,
+    items: Sequence[T],
+    fn: Callable[[T], Optional[Iterable[Any]]],
+) -> List[T]:
+    """
+    Run fn over items on worker threads and append each result to path as
+    JSON lines, in input order; return the items whose result was written.
+
+    Only the calling thread writes, so appends never interleave. An item whose
+    fn returns None is skipped.
+    """
+    written: List[T] = []
+    fd = open_append(path)
+    try:
+        for item, objs in zip(items, map_ordered(fn, items)):
+            if objs is None:
+                continue
+            if objs:
+                append_jsonl(fd, objs)
+            written.append(item)
+    finally:
+        os.close(fd)
+    return written
@@ -8,5 +8,8 @@ INBOX_DIR = RESEARCH_ROOT / "inbox"
 OUT_DIR = RESEARCH_ROOT / "out"
 STATE_DIR = RESEARCH_ROOT / "state"
 
-for _d in (RESEARCH_ROOT, INBOX_DIR, OUT_DIR, STATE_DIR):
-    _d.mkdir(parents=True, exist_ok=True)
+# Children first: creating them with parents=True also creates RESEARCH_ROOT,
+# and on warm checkouts each dir costs one stat() instead of a failing mkdir().
+for _d in (INBOX_DIR, OUT_DIR, STATE_DIR):
+    if not _d.is_dir():
+        _d.mkdir(parents=True, exist_ok=True)
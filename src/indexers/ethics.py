@@ -1,8 +1,10 @@
-import json
 from datetime import datetime
 from pathlib import Path
+from typing import List
 
+from ._io import CHUNK_BYTES, map_reduce, parse_partials, read_jsonl_chunks, read_or_empty
 from ._paths import OUT_DIR
+from .. import _json
 from ..llm_client import call_llm
 
 
@@ -11,59 +13,94 @@ TIMELINE_FILE = OUT_DIR / "timeline.json"
 ETHICS_FILE = OUT_DIR / "ethics_report.json"
 
 
-def run() -> None:
-    """
-    Indexer-Ethics-001
+_SCHEMA = (
+    "{\n"
+    '  "generated_at": iso8601,\n'
+    '  "sensitive_topics": [str, ...],\n'
+    '  "required_disclaimers": [str, ...],\n'
+    '  "privacy_risks": [str, ...],\n'
+    '  "legal_risks": [str, ...],\n'
+    '  "red_lines": [str, ...],\n'
+    '  "notes": str\n'
+    "}"
+)
 
-    Reviews the research corpus and timeline for ethical / safety concerns and
-    produces a structured ethics guidance JSON.
-    """
-    fragments = (
-        FRAGMENTS_FILE.read_text(encoding="utf-8")
-        if FRAGMENTS_FILE.exists()
-        else ""
-    )
-    timeline = (
-        TIMELINE_FILE.read_text(encoding="utf-8")
-        if TIMELINE_FILE.exists()
-        else ""
-    )
+_SYSTEM_MSG = (
+    "You are an ethics / safety reviewer for a memoir+technical book. "
+    "Identify: (1) sensitive topics, (2) legal risk, (3) privacy concerns, "
+    "(4) where strong disclaimers are required, and (5) red lines that "
+    "should not be crossed. Output JSON with:\n" + _SCHEMA
+)
 
-    system_msg = (
-        "You are an ethics / safety reviewer for a memoir+technical book. "
-        "Identify: (1) sensitive topics, (2) legal risk, (3) privacy concerns, "
-        "(4) where strong disclaimers are required, and (5) red lines that "
-        "should not be crossed. Output JSON with:\n"
-        "{\n"
-        '  "generated_at": iso8601,\n'
-        '  "sensitive_topics": [str, ...],\n'
-        '  "required_disclaimers": [str, ...],\n'
-        '  "privacy_risks": [str, ...],\n'
-        '  "legal_risks": [str, ...],\n'
-        '  "red_lines": [str, ...],\n'
-        '  "notes": str\n'
-        "}"
-    )
+_MERGE_SYSTEM_MSG = (
+    "You are merging partial ethics reviews, each written from a different "
+    "batch of research fragments. Combine items that raise the same concern, "
+    "keep every distinct one, add any the timeline raises, and return one "
+    "review in exactly this JSON form:\n" + _SCHEMA
+)
 
+_SYSTEM_ROLE_MSG = {"role": "system", "content": _SYSTEM_MSG}
+_MERGE_SYSTEM_ROLE_MSG = {"role": "system", "content": _MERGE_SYSTEM_MSG}
+
+
+def _review(timeline: str, fragments: str) -> str:
     user_msg = (
         "Timeline (may be empty):\n"
         f"{timeline}\n\n"
-        "Fragments (JSONL, may be truncated):\n"
-        f"{fragments[:5000]}\n\n"
+        "Fragments (JSONL):\n"
+        f"{fragments}\n\n"
         "Generate the ethics JSON as described."
     )
+    return call_llm(
+        messages=[
+            _SYSTEM_ROLE_MSG,
+            {"role": "user", "content": user_msg},
+        ],
+        max_tokens=1800,
+    )
+
 
-    content = call_llm(
+def _merge(timeline: str, partials: List[str]) -> str:
+    """Reduce step: one call over the timeline and every chunk's review."""
+    parts = parse_partials(partials, "Indexer-Ethics-001")
+    user_msg = (
+        "Timeline (may be empty):\n"
+        f"{timeline}\n\n"
+        "Here are the partial ethics reviews as JSON:\n\n"
+        f"{_json.dumps(parts).decode('utf-8')}\n\n"
+        "Generate the merged ethics JSON as described."
+    )
+    return call_llm(
         messages=[
-            {"role": "system", "content": system_msg},
+            _MERGE_SYSTEM_ROLE_MSG,
             {"role": "user", "content": user_msg},
         ],
         max_tokens=1800,
     )
 
+
+def run() -> None:
+    """
+    Indexer-Ethics-001
+
+    Reviews the research corpus and timeline for ethical / safety concerns and
+    produces a structured ethics guidance JSON. Large corpora are reviewed
+    in chunks in parallel and then merged with one final call.
+    """
+    timeline = read_or_empty(TIMELINE_FILE)
+    chunks, _ = read_jsonl_chunks(FRAGMENTS_FILE, CHUNK_BYTES)
+
+    # The timeline goes to the single or final call only, not to every chunk.
+    content = map_reduce(
+        chunks or [""],
+        lambda chunk: _review("", chunk),
+        lambda partials: _merge(timeline, partials),
+        single_fn=lambda chunk: _review(timeline, chunk),
+    )
+
     try:
-        obj = json.loads(content)
-    except json.JSONDecodeError:
+        obj = _json.loads(content)
+    except _json.JSONDecodeError:
         obj = {
             "generated_at": datetime.utcnow().isoformat() + "Z",
             "sensitive_topics": [],
@@ -74,7 +111,5 @@ def run() -> None:
             "notes": content,
         }
 
-    ETHICS_FILE.write_text(
-        json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8"
-    )
+    ETHICS_FILE.write_bytes(_json.dumps(obj, indent=True))
     print(f"[Indexer-Ethics-001] Wrote ethics report to {ETHICS_FILE}")
@@ -20,12 +20,18 @@ Fragments written here are consumed by:
 - GrantFinder-001
 """
 
-import json
 from datetime import datetime
 from pathlib import Path
-from typing import List, Tuple, Dict
-
+from typing import List, Optional, Tuple, Dict
+
+from ._io import (
+    append_processed,
+    load_processed,
+    process_and_append,
+    walk_files,
+)
 from ._paths import OUT_DIR, STATE_DIR
+from .. import _json
 from ..llm_client import call_llm
 
 
@@ -40,6 +46,9 @@ FREE_DOM_ROOT = Path(__file__).resolve().parents[2] / "FREE-DOM"
 STATE_FILE = STATE_DIR / "freedom_processed_files.txt"
 FRAGMENTS_FILE = OUT_DIR / "research_fragments.jsonl"
 
+# Binary / image suffixes never sent to the LLM (lowercase, no dot)
+SKIP_SUFFIXES = frozenset({"png", "jpg", "jpeg", "gif", "zip", "pdf", "mp3", "mp4"})
+
 # -------------------------------------------------------
 # Buckets: knows confidence + evidence type for each data zone
 # -------------------------------------------------------
@@ -75,19 +84,11 @@ BUCKETS: List[Dict[str, object]] = [
 # Helper functions
 # -------------------------------------------------------
 def _load_processed() -> set:
-    if not STATE_FILE.exists():
-        return set()
-    return {
-        line.strip()
-        for line in STATE_FILE.read_text(encoding="utf-8").splitlines()
-        if line.strip()
-    }
+    return load_processed(STATE_FILE)
 
 
 def _save_processed(keys: List[str]) -> None:
-    existing = _load_processed()
-    existing.update(keys)
-    STATE_FILE.write_text("\n".join(sorted(existing)) + "\n", encoding="utf-8")
+    append_processed(STATE_FILE, keys)
 
 
 def _iter_new_files() -> List[Tuple[Path, str, Dict[str, object]]]:
@@ -108,25 +109,119 @@ def _iter_new_files() -> List[Tuple[Path, str, Dict[str, object]]]:
         if not base.exists():
             continue
 
-        for path in sorted(base.rglob("*")):
-            if not path.is_file():
-                continue
-
-            rel_id = path.relative_to(FREE_DOM_ROOT).as_posix()
+        # binary / images are skipped inside the walk
+        prefix = base.relative_to(FREE_DOM_ROOT).as_posix() + "/"
+        for path, rel in walk_files(base, SKIP_SUFFIXES):
+            rel_id = prefix + rel
             key = f"{bucket_name}::{rel_id}"
 
             if key in processed:
                 continue
 
-            # skip binary / images
-            if path.suffix.lower() in {".png", ".jpg", ".jpeg", ".gif", ".zip"}:
-                continue
-
             results.append((path, rel_id, bucket))
 
     return results
 
 
+# -------------------------------------------------------
+# LLM instructions
+# -------------------------------------------------------
+_SYSTEM_MSG = (
+    "You are a research indexer converting factual data into structured "
+    "research fragments. Use ONLY the content provided. DO NOT invent.\n\n"
+    "Bucket semantics:\n"
+    "- master: verified high-confidence public record\n"
+    "- unverified: leads, unconfirmed, low confidence\n"
+    "- summary: aggregate dashboards and coverage maps\n"
+    "- logs: raw RSS/news scan hits\n\n"
+    "Return only newline-separated JSON objects with schema:\n"
+    "{\n"
+    '  "source_repo": "FREE-DOM",\n'
+    '  "source_bucket": "...",\n'
+    '  "source_id": str,\n'
+    '  "source_path": str,\n'
+    '  "approx_date_text": str,\n'
+    '  "summary": str,\n'
+    '  "key_points": [str],\n'
+    '  "actors": [str],\n'
+    '  "locations": [str],\n'
+    '  "tags": [str],\n'
+    '  "evidence_type": "...",\n'
+    '  "confidence": "high|medium|low"\n'
+    "}\n"
+)
+_SYSTEM_ROLE_MSG = {"role": "system", "content": _SYSTEM_MSG}
+
+
+def _process_file(
+    path: Path, rel_id: str, bucket: Dict[str, object], ingested_ts: str
+) -> Optional[List[dict]]:
+    """
+    Read one FREE-DOM file, index it with the LLM and return its fragments.
+
+    Returns None if the file could not be read. Does no output I/O so it
+    can run on a worker thread.
+    """
+    bucket_name = bucket["name"]
+    default_evidence_type = bucket["default_evidence_type"]
+    default_confidence = bucket["default_confidence"]
+
+    try:
+        raw = path.read_text(encoding="utf-8", errors="ignore")
+    except Exception as exc:
+        print(f"[Indexer-FreeDom-001] Failed to read {rel_id}: {exc}")
+        return None
+
+    print(
+        f"[Indexer-FreeDom-001] → Indexing {rel_id}"
+        f" — bucket={bucket_name}, size={len(raw)} chars"
+    )
+
+    user_msg = (
+        f"FREE-DOM file: {rel_id}\n"
+        f"Bucket: {bucket_name}\n"
+        f"Ingested: {ingested_ts}\n\n"
+        f"Content:\n{raw}"
+    )
+
+    response = call_llm(
+        messages=[
+            _SYSTEM_ROLE_MSG,
+            {"role": "user", "content": user_msg},
+        ],
+        max_tokens=1500,
+    )
+
+    # -------------------------------------------------------
+    # Parse each JSON object (one per line or pretty-printed)
+    # -------------------------------------------------------
+    def _fallback(line: str) -> dict:
+        return {
+            "source_repo": "FREE-DOM",
+            "source_bucket": bucket_name,
+            "source_id": f"fallback::{rel_id}",
+            "source_path": rel_id,
+            "approx_date_text": "",
+            "summary": line,
+            "key_points": [],
+            "actors": [],
+            "locations": [],
+            "tags": ["fallback"],
+            "evidence_type": default_evidence_type,
+            "confidence": default_confidence,
+        }
+
+    objs = _json.loads_many(response, _fallback)
+    for obj in objs:
+        # Ensure defaults exist
+        obj.setdefault("source_repo", "FREE-DOM")
+        obj.setdefault("source_bucket", bucket_name)
+        obj.setdefault("source_path", rel_id)
+        obj.setdefault("evidence_type", default_evidence_type)
+        obj.setdefault("confidence", default_confidence)
+    return objs
+
+
 # -------------------------------------------------------
 # Main runner
 # -------------------------------------------------------
@@ -143,104 +238,10 @@ def run() -> None:
 
     print(f"[Indexer-FreeDom-001] Processing {len(new_files)} new FREE-DOM file(s).")
 
-    processed_keys = []
-
-    with FRAGMENTS_FILE.open("a", encoding="utf-8") as fh:
-        for path, rel_id, bucket in new_files:
-            bucket_name = bucket["name"]
-            default_evidence_type = bucket["default_evidence_type"]
-            default_confidence = bucket["default_confidence"]
-
-            try:
-                raw = path.read_text(encoding="utf-8", errors="ignore")
-            except Exception as exc:
-                print(f"[Indexer-FreeDom-001] Failed to read {rel_id}: {exc}")
-                continue
+    ingested_ts = datetime.utcnow().isoformat() + "Z"
+    done = process_and_append(
+        FRAGMENTS_FILE, new_files, lambda item: _process_file(*item, ingested_ts)
+    )
 
-            print(
-                f"[Indexer-FreeDom-001] → Indexing {rel_id}"
-                f" — bucket={bucket_name}, size={len(raw)} chars"
-            )
-
-            # -------------------------------------------------------
-            # LLM instructions
-            # -------------------------------------------------------
-            system_msg = (
-                "You are a research indexer converting factual data into structured "
-                "research fragments. Use ONLY the content provided. DO NOT invent.\n\n"
-                "Bucket semantics:\n"
-                "- master: verified high-confidence public record\n"
-                "- unverified: leads, unconfirmed, low confidence\n"
-                "- summary: aggregate dashboards and coverage maps\n"
-                "- logs: raw RSS/news scan hits\n\n"
-                "Return only newline-separated JSON objects with schema:\n"
-                "{\n"
-                '  "source_repo": "FREE-DOM",\n'
-                '  "source_bucket": "...",\n'
-                '  "source_id": str,\n'
-                '  "source_path": str,\n'
-                '  "approx_date_text": str,\n'
-                '  "summary": str,\n'
-                '  "key_points": [str],\n'
-                '  "actors": [str],\n'
-                '  "locations": [str],\n'
-                '  "tags": [str],\n'
-                '  "evidence_type": "...",\n'
-                '  "confidence": "high|medium|low"\n'
-                "}\n"
-            )
-
-            user_msg = (
-                f"FREE-DOM file: {rel_id}\n"
-                f"Bucket: {bucket_name}\n"
-                f"Ingested: {datetime.utcnow().isoformat()}Z\n\n"
-                f"Content:\n{raw}"
-            )
-
-            response = call_llm(
-                messages=[
-                    {"role": "system", "content": system_msg},
-                    {"role": "user", "content": user_msg},
-                ],
-                max_tokens=1500,
-            )
-
-            # -------------------------------------------------------
-            # Parse each JSONL line
-            # -------------------------------------------------------
-            for line in response.splitlines():
-                line = line.strip()
-                if not line:
-                    continue
-
-                try:
-                    obj = json.loads(line)
-                except json.JSONDecodeError:
-                    obj = {
-                        "source_repo": "FREE-DOM",
-                        "source_bucket": bucket_name,
-                        "source_id": f"fallback::{rel_id}",
-                        "source_path": rel_id,
-                        "approx_date_text": "",
-                        "summary": line,
-                        "key_points": [],
-                        "actors": [],
-                        "locations": [],
-                        "tags": ["fallback"],
-                        "evidence_type": default_evidence_type,
-                        "confidence": default_confidence,
-                    }
-
-                # Ensure defaults exist
-                obj.setdefault("source_repo", "FREE-DOM")
-                obj.setdefault("source_bucket", bucket_name)
-                obj.setdefault("source_path", rel_id)
-                obj.setdefault("evidence_type", default_evidence_type)
-                obj.setdefault("confidence", default_confidence)
-
-                fh.write(json.dumps(obj, ensure_ascii=False) + "\n")
-
-            processed_keys.append(f"{bucket_name}::{rel_id}")
-
-    _save_processed(processed_keys)
+    _save_processed([f"{bucket['name']}::{rel_id}" for _, rel_id, bucket in done])
     print("[Indexer-FreeDom-001] Completed & state updated.")
@@ -1,8 +1,10 @@
-import json
 from datetime import datetime
 from pathlib import Path
+from typing import List
 
+from ._io import CHUNK_BYTES, map_reduce, parse_partials, read_jsonl_chunks, read_or_empty
 from ._paths import OUT_DIR
+from .. import _json
 from ..llm_client import call_llm
 
 
@@ -11,56 +13,91 @@ TIMELINE_FILE = OUT_DIR / "timeline.json"
 GAPS_FILE = OUT_DIR / "gap_analysis.json"
 
 
-def run() -> None:
-    """
-    Indexer-Gaps-001
+_SCHEMA = (
+    "{\n"
+    '  "generated_at": iso8601,\n'
+    '  "open_questions": [str, ...],\n'
+    '  "missing_evidence": [str, ...],\n'
+    '  "priority_research_tasks": [str, ...],\n'
+    '  "notes": str\n'
+    "}"
+)
 
-    Analyses the corpus for missing pieces, contradictions, or areas that need
-    more research before a book can be written.
-    """
-    fragments = (
-        FRAGMENTS_FILE.read_text(encoding="utf-8")
-        if FRAGMENTS_FILE.exists()
-        else ""
-    )
-    timeline = (
-        TIMELINE_FILE.read_text(encoding="utf-8")
-        if TIMELINE_FILE.exists()
-        else ""
-    )
+_SYSTEM_MSG = (
+    "You are a research project planner. Given the fragments and timeline, "
+    "identify open questions, missing evidence, and sections where further "
+    "research is required. Output JSON:\n" + _SCHEMA
+)
 
-    system_msg = (
-        "You are a research project planner. Given the fragments and timeline, "
-        "identify open questions, missing evidence, and sections where further "
-        "research is required. Output JSON:\n"
-        "{\n"
-        '  "generated_at": iso8601,\n'
-        '  "open_questions": [str, ...],\n'
-        '  "missing_evidence": [str, ...],\n'
-        '  "priority_research_tasks": [str, ...],\n'
-        '  "notes": str\n'
-        "}"
-    )
+_MERGE_SYSTEM_MSG = (
+    "You are merging partial gap analyses, each written from a different "
+    "batch of research fragments. Drop questions that another batch or the "
+    "timeline already answers, combine duplicates, order research tasks by "
+    "priority, and return one analysis in exactly this JSON form:\n" + _SCHEMA
+)
 
+_SYSTEM_ROLE_MSG = {"role": "system", "content": _SYSTEM_MSG}
+_MERGE_SYSTEM_ROLE_MSG = {"role": "system", "content": _MERGE_SYSTEM_MSG}
+
+
+def _analyse(timeline: str, fragments: str) -> str:
     user_msg = (
         "Timeline (may be empty):\n"
         f"{timeline}\n\n"
-        "Fragments (JSONL, may be truncated):\n"
-        f"{fragments[:5000]}\n\n"
+        "Fragments (JSONL):\n"
+        f"{fragments}\n\n"
         "Generate the gap analysis JSON."
     )
+    return call_llm(
+        messages=[
+            _SYSTEM_ROLE_MSG,
+            {"role": "user", "content": user_msg},
+        ],
+        max_tokens=1800,
+    )
+
 
-    content = call_llm(
+def _merge(timeline: str, partials: List[str]) -> str:
+    """Reduce step: one call over the timeline and every chunk's analysis."""
+    parts = parse_partials(partials, "Indexer-Gaps-001")
+    user_msg = (
+        "Timeline (may be empty):\n"
+        f"{timeline}\n\n"
+        "Here are the partial gap analyses as JSON:\n\n"
+        f"{_json.dumps(parts).decode('utf-8')}\n\n"
+        "Generate the merged gap analysis JSON."
+    )
+    return call_llm(
         messages=[
-            {"role": "system", "content": system_msg},
+            _MERGE_SYSTEM_ROLE_MSG,
             {"role": "user", "content": user_msg},
         ],
         max_tokens=1800,
     )
 
+
+def run() -> None:
+    """
+    Indexer-Gaps-001
+
+    Analyses the corpus for missing pieces, contradictions, or areas that need
+    more research before a book can be written. Large corpora are analysed
+    in chunks in parallel and then merged with one final call.
+    """
+    timeline = read_or_empty(TIMELINE_FILE)
+    chunks, _ = read_jsonl_chunks(FRAGMENTS_FILE, CHUNK_BYTES)
+
+    # The timeline goes to the single or final call only, not to every chunk.
+    content = map_reduce(
+        chunks or [""],
+        lambda chunk: _analyse("", chunk),
+        lambda partials: _merge(timeline, partials),
+        single_fn=lambda chunk: _analyse(timeline, chunk),
+    )
+
     try:
-        obj = json.loads(content)
-    except json.JSONDecodeError:
+        obj = _json.loads(content)
+    except _json.JSONDecodeError:
         obj = {
             "generated_at": datetime.utcnow().isoformat() + "Z",
             "open_questions": [],
@@ -69,7 +106,5 @@ def run() -> None:
             "notes": content,
         }
 
-    GAPS_FILE.write_text(
-        json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8"
-    )
+    GAPS_FILE.write_bytes(_json.dumps(obj, indent=True))
     print(f"[Indexer-Gaps-001] Wrote gap analysis to {GAPS_FILE}")
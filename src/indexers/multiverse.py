@@ -1,7 +1,9 @@
-import json
 from pathlib import Path
+from typing import List
 
+from ._io import CHUNK_BYTES, map_reduce, parse_partials, read_jsonl_chunks, read_or_empty
 from ._paths import OUT_DIR
+from .. import _json
 from ..llm_client import call_llm
 
 
@@ -10,66 +12,112 @@ FRAGMENTS_FILE = OUT_DIR / "research_fragments.jsonl"
 PLOTS_FILE = OUT_DIR / "plot_branches.json"
 
 
-def run() -> None:
-    """
-    Indexer-Multiverse-001
+_SCHEMA = (
+    "{\n"
+    '  "branches": [\n'
+    "    {\n"
+    '      "id": str,\n'
+    '      "label": str,\n'
+    '      "description": str,\n'
+    '      "emphasis": ["technical", "personal", "political", "spiritual", ...],\n'
+    '      "key_events": [event_id, ...]\n'
+    "    }, ...\n"
+    "  ]\n"
+    "}"
+)
 
-    Given the timeline + fragments, propose alternate narrative branches:
-    different ways to tell the story while staying anchored to facts.
-    """
-    if not TIMELINE_FILE.exists():
-        print(
-            "[Indexer-Multiverse-001] No timeline.json; run Indexer-Timeline-001 first."
-        )
-        return
+_SYSTEM_MSG = (
+    "You are a narrative architect. Given a factual timeline and research "
+    "fragments, enumerate several plausible narrative 'branches' (ways to "
+    "tell the story) that remain honest to the underlying evidence.\n\n"
+    "Output JSON:\n" + _SCHEMA
+)
 
-    timeline = TIMELINE_FILE.read_text(encoding="utf-8")
-    fragments = (
-        FRAGMENTS_FILE.read_text(encoding="utf-8")
-        if FRAGMENTS_FILE.exists()
-        else ""
-    )
+_MERGE_SYSTEM_MSG = (
+    "You are merging narrative branches proposed from different batches of "
+    "research fragments. Combine branches that tell the story the same way, "
+    "keep every distinct one, set each branch's key_events to the ids of the "
+    "timeline events it rests on, and return them in exactly this JSON "
+    "form:\n" + _SCHEMA
+)
 
-    system_msg = (
-        "You are a narrative architect. Given a factual timeline and research "
-        "fragments, enumerate several plausible narrative 'branches' (ways to "
-        "tell the story) that remain honest to the underlying evidence.\n\n"
-        "Output JSON:\n"
-        "{\n"
-        '  "branches": [\n'
-        "    {\n"
-        '      "id": str,\n'
-        '      "label": str,\n'
-        '      "description": str,\n'
-        '      "emphasis": ["technical", "personal", "political", "spiritual", ...],\n'
-        '      "key_events": [event_id, ...]\n'
-        "    }, ...\n"
-        "  ]\n"
-        "}"
+_SYSTEM_ROLE_MSG = {"role": "system", "content": _SYSTEM_MSG}
+_MERGE_SYSTEM_ROLE_MSG = {"role": "system", "content": _MERGE_SYSTEM_MSG}
+
+
+def _branches_for(timeline: str, fragments: str) -> str:
+    if timeline:
+        context = f"Timeline JSON:\n{timeline}\n\n"
+    else:
+        # Map step: the timeline is only sent to the final merge call.
+        context = "No timeline for this batch; leave key_events empty.\n\n"
+    user_msg = (
+        f"{context}"
+        "Research fragments (JSONL):\n"
+        f"{fragments}\n\n"
+        "Build the branches JSON."
+    )
+    return call_llm(
+        messages=[
+            _SYSTEM_ROLE_MSG,
+            {"role": "user", "content": user_msg},
+        ],
+        max_tokens=1800,
     )
 
+
+def _merge(timeline: str, partials: List[str]) -> str:
+    """Reduce step: one call over the timeline and every chunk's branches."""
+    branches = []
+    for part in parse_partials(partials, "Indexer-Multiverse-001"):
+        branches.extend(part.get("branches") or [])
+
     user_msg = (
         "Timeline JSON:\n"
         f"{timeline}\n\n"
-        "Research fragments (JSONL, may be truncated):\n"
-        f"{fragments[:4000]}\n\n"
-        "Build the branches JSON."
+        "Here are the branches from every partial result as JSON:\n\n"
+        f"{_json.dumps(branches).decode('utf-8')}\n\n"
+        "Build the merged branches JSON."
     )
-
-    content = call_llm(
+    return call_llm(
         messages=[
-            {"role": "system", "content": system_msg},
+            _MERGE_SYSTEM_ROLE_MSG,
             {"role": "user", "content": user_msg},
         ],
         max_tokens=1800,
     )
 
+
+def run() -> None:
+    """
+    Indexer-Multiverse-001
+
+    Given the timeline + fragments, propose alternate narrative branches:
+    different ways to tell the story while staying anchored to facts.
+    Large corpora are read in chunks in parallel and the branches merged
+    with one final call.
+    """
+    timeline = read_or_empty(TIMELINE_FILE)
+    if not timeline:
+        print(
+            "[Indexer-Multiverse-001] No timeline.json; run Indexer-Timeline-001 first."
+        )
+        return
+
+    chunks, _ = read_jsonl_chunks(FRAGMENTS_FILE, CHUNK_BYTES)
+
+    # The timeline goes to the single or final call only, not to every chunk.
+    content = map_reduce(
+        chunks or [""],
+        lambda chunk: _branches_for("", chunk),
+        lambda partials: _merge(timeline, partials),
+        single_fn=lambda chunk: _branches_for(timeline, chunk),
+    )
+
     try:
-        obj = json.loads(content)
-    except json.JSONDecodeError:
+        obj = _json.loads(content)
+    except _json.JSONDecodeError:
         obj = {"branches": [], "raw": content}
 
-    PLOTS_FILE.write_text(
-        json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8"
-    )
+    PLOTS_FILE.write_bytes(_json.dumps(obj, indent=True))
     print(f"[Indexer-Multiverse-001] Wrote plot branches to {PLOTS_FILE}")
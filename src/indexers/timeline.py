@@ -1,8 +1,10 @@
-import json
 from datetime import datetime
 from pathlib import Path
+from typing import Any, List
 
+from ._io import CHUNK_BYTES, map_reduce, parse_partials, read_jsonl_chunks
 from ._paths import OUT_DIR
+from .. import _json
 from ..llm_client import call_llm
 
 
@@ -10,63 +12,105 @@ FRAGMENTS_FILE = OUT_DIR / "research_fragments.jsonl"
 TIMELINE_FILE = OUT_DIR / "timeline.json"
 
 
+_SYSTEM_MSG = (
+    "You are building a chronological timeline from JSONL research fragments. "
+    "Each line is a JSON object as previously described. Produce a compact JSON "
+    "structure of the form:\n"
+    "{\n"
+    '  "generated_at": iso8601,\n'
+    '  "events": [\n'
+    "     {\n"
+    '       "id": str,\n'
+    '       "approx_date_text": str,\n'
+    '       "summary": str,\n'
+    '       "actors": [str, ...],\n'
+    '       "locations": [str, ...],\n'
+    '       "source_ids": [str, ...],\n'
+    '       "tags": [str, ...]\n'
+    "     }, ...\n"
+    "  ]\n"
+    "}\n"
+    "Sort events in chronological order based on the fragment dates when possible."
+)
+
+_MERGE_SYSTEM_MSG = (
+    "You are merging partial timelines built from disjoint batches of research "
+    "fragments. Deduplicate events that describe the same thing (union their "
+    "source_ids, actors, locations and tags), then return the unified timeline "
+    "in exactly this JSON form:\n"
+    "{\n"
+    '  "generated_at": iso8601,\n'
+    '  "events": [ {"id", "approx_date_text", "summary", "actors", '
+    '"locations", "source_ids", "tags"}, ... ]\n'
+    "}\n"
+    "Sort events in chronological order based on approx_date_text when possible."
+)
+
+_SYSTEM_ROLE_MSG = {"role": "system", "content": _SYSTEM_MSG}
+_MERGE_SYSTEM_ROLE_MSG = {"role": "system", "content": _MERGE_SYSTEM_MSG}
+
+
+def _timeline_for(chunk: str) -> str:
+    user_msg = (
+        "Here are all research fragments as JSONL:\n\n"
+        f"{chunk}\n\n"
+        "Build the unified timeline JSON as described."
+    )
+    return call_llm(
+        messages=[
+            _SYSTEM_ROLE_MSG,
+            {"role": "user", "content": user_msg},
+        ],
+        max_tokens=2800,
+    )
+
+
+def _merge(partials: List[str]) -> str:
+    """Reduce step: one call over the events extracted from every chunk."""
+    events: List[Any] = []
+    for part in parse_partials(partials, "Indexer-Timeline-001"):
+        events.extend(part.get("events") or [])
+
+    user_msg = (
+        "Here are the events from every partial timeline as JSON:\n\n"
+        f"{_json.dumps(events).decode('utf-8')}\n\n"
+        "Build the unified timeline JSON as described."
+    )
+    return call_llm(
+        messages=[
+            _MERGE_SYSTEM_ROLE_MSG,
+            {"role": "user", "content": user_msg},
+        ],
+        max_tokens=2800,
+    )
+
+
 def run() -> None:
     """
     Indexer-Timeline-001
 
     Builds a coarse, human-readable timeline from harvested fragments.
+    Large corpora are split into chunks that are indexed in parallel and
+    then merged with one final call.
     """
-    if not FRAGMENTS_FILE.exists():
+    chunks, count = read_jsonl_chunks(FRAGMENTS_FILE, CHUNK_BYTES)
+    if not chunks:
         print(
             "[Indexer-Timeline-001] No fragments found at "
             f"{FRAGMENTS_FILE}; run Indexer-Harvest-001 first."
         )
         return
 
-    text = FRAGMENTS_FILE.read_text(encoding="utf-8")
     print(
         f"[Indexer-Timeline-001] Loaded {FRAGMENTS_FILE} "
-        f"({len(text.splitlines())} fragments)."
+        f"({count} fragments, {len(chunks)} chunk(s))."
     )
 
-    system_msg = (
-        "You are building a chronological timeline from JSONL research fragments. "
-        "Each line is a JSON object as previously described. Produce a compact JSON "
-        "structure of the form:\n"
-        "{\n"
-        '  "generated_at": iso8601,\n'
-        '  "events": [\n'
-        "     {\n"
-        '       "id": str,\n'
-        '       "approx_date_text": str,\n'
-        '       "summary": str,\n'
-        '       "actors": [str, ...],\n'
-        '       "locations": [str, ...],\n'
-        '       "source_ids": [str, ...],\n'
-        '       "tags": [str, ...]\n'
-        "     }, ...\n"
-        "  ]\n"
-        "}\n"
-        "Sort events in chronological order based on the fragment dates when possible."
-    )
-
-    user_msg = (
-        "Here are all research fragments as JSONL:\n\n"
-        f"{text}\n\n"
-        "Build the unified timeline JSON as described."
-    )
-
-    content = call_llm(
-        messages=[
-            {"role": "system", "content": system_msg},
-            {"role": "user", "content": user_msg},
-        ],
-        max_tokens=2800,
-    )
+    content = map_reduce(chunks, _timeline_for, _merge)
 
     try:
-        obj = json.loads(content)
-    except json.JSONDecodeError:
+        obj = _json.loads(content)
+    except _json.JSONDecodeError:
         # Wrap raw LLM content into a minimal envelope
         obj = {
             "generated_at": datetime.utcnow().isoformat() + "Z",
@@ -74,7 +118,5 @@ def run() -> None:
             "raw": content,
         }
 
-    TIMELINE_FILE.write_text(
-        json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8"
-    )
+    TIMELINE_FILE.write_bytes(_json.dumps(obj, indent=True))
     print(f"[Indexer-Timeline-001] Wrote timeline to {TIMELINE_FILE}")
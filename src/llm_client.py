@@ -1,77 +1,350 @@
+import asyncio
+import functools
+import hashlib
 import os
+import random
+import threading
 import time
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Dict, Any, Iterator, Optional, Union
 
-import requests
+from . import _json
+
+if TYPE_CHECKING:  # pragma: no cover
+    import requests
 
 
 API_URL = "https://api.openai.com/v1/chat/completions"
 
 
+@functools.lru_cache(maxsize=1)
+def _session() -> "requests.Session":
+    # One keep-alive session for every call, so repeated calls (and the indexer
+    # worker threads) reuse pooled TCP/TLS connections instead of handshaking
+    # each time. Retries stay in call_llm, hence max_retries=0. requests is
+    # imported here, on first use, so importing this module stays cheap.
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0))
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+
+# Deterministic (temperature 0 or cacheable=True) responses are cached on disk,
+# one file per request hash, and reused for a week; expired files are deleted.
+CACHE_DIR = Path(
+    os.environ.get("STEGVERSE_LLM_CACHE_DIR") or Path.home() / ".cache" / "stegagents_llm"
+)
+CACHE_TTL_SECONDS = 7 * 86400
+
+
 class MissingAPIKey(RuntimeError):
     pass
 
 
+@functools.lru_cache(maxsize=1)
 def _get_api_key() -> str:
+    # Read once per process; a missing key raises and is not cached.
     key = os.environ.get("OPENAI_API_KEY")
     if not key:
         raise MissingAPIKey("OPENAI_API_KEY not set in environment")
     return key
 
 
+@functools.lru_cache(maxsize=1)
+def _headers() -> Dict[str, str]:
+    # Per-request headers, built once; Content-Type lives on the session and
+    # requests merges (copies) these, so sharing the dict is safe.
+    return {"Authorization": f"Bearer {_get_api_key()}"}
+
+
+def _cache_get(key: str) -> Optional[str]:
+    path = CACHE_DIR / f"{key}.txt"
+    try:
+        if time.time() - path.stat().st_mtime > CACHE_TTL_SECONDS:
+            path.unlink(missing_ok=True)
+            return None
+        return path.read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+
+@functools.lru_cache(maxsize=1)
+def _prune_cache() -> None:
+    # Once per process: expire entries that are never read again, and temp
+    # files left behind by interrupted writes.
+    cutoff = time.time() - CACHE_TTL_SECONDS
+    try:
+        it = os.scandir(CACHE_DIR)
+    except OSError:
+        return
+    with it:
+        for e in it:
+            try:
+                if e.name.endswith((".txt", ".tmp")) and e.stat().st_mtime < cutoff:
+                    os.unlink(e.path)
+            except OSError:
+                pass
+
+
+def _cache_put(key: str, content: str) -> None:
+    # Write-then-rename so concurrent readers never see a partial entry.
+    _prune_cache()
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = CACHE_DIR / f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp.write_text(content, encoding="utf-8")
+        os.replace(tmp, CACHE_DIR / f"{key}.txt")
+    except OSError as exc:
+        print(f"[llm_client] Could not write response cache: {exc}")
+
+
+def _sleep_for_retry(resp: "requests.Response", attempt: int, retries: int, base: float, cap: float = 60.0) -> None:
+    """
+    Back off before retrying a transient failure.
+
+    A Retry-After header (delta-seconds or HTTP-date) from the server wins;
+    otherwise sleep a "full jitter" random slice of the exponential window
+    base * 2**(attempt-1), so parallel workers don't retry in lockstep.
+    """
+    delay: Optional[float] = None
+    retry_after = resp.headers.get("Retry-After")
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                when = parsedate_to_datetime(retry_after)
+                delay = (when - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                delay = None
+    if delay is None:
+        delay = random.uniform(0, min(cap, base * (2 ** (attempt - 1))))
+    delay = min(cap, max(0.0, delay))
+
+    print(
+        f"[llm_client] Transient error {resp.status_code} on attempt "
+        f"{attempt}/{retries}; backing off {delay:.1f}s..."
+    )
+    time.sleep(delay)
+
+
+def _error_snippet(resp: "requests.Response", limit: int = 500) -> str:
+    # Log at most `limit` bytes of an error body, then drop the connection.
+    try:
+        head = next(resp.iter_content(limit), b"")
+    finally:
+        resp.close()
+    return head.decode("utf-8", errors="replace")
+
+
+def _post_chat(body: bytes, retries: int, initial_backoff: float) -> List[str]:
+    """
+    POST one chat completion request; returns the content of every choice.
+
+    `body` is the already-encoded JSON payload, sent as-is on every attempt.
+    """
+    session = _session()
+    from requests.exceptions import HTTPError
+
+    headers = _headers()
+
+    for attempt in range(1, retries + 1):
+        # stream=True defers the body: error pages are never read in full.
+        resp = session.post(API_URL, headers=headers, data=body, stream=True)
+        try:
+            resp.raise_for_status()
+        except HTTPError as exc:
+            status = resp.status_code
+            # Gentle handling for rate limits
+            if status in (429, 500, 502, 503, 504) and attempt < retries:
+                resp.close()
+                _sleep_for_retry(resp, attempt, retries, base=initial_backoff)
+                continue
+
+            # Re-raise for non-retryable or final failure
+            print(f"[llm_client] HTTP error from OpenAI: {status} {_error_snippet(resp)}")
+            raise exc
+
+        data = _json.loads(resp.content)
+        try:
+            choices = [c["message"]["content"] for c in data["choices"]]
+            if not choices:
+                raise IndexError("no choices")
+        except (KeyError, IndexError, TypeError) as exc:  # pragma: no cover
+            raise RuntimeError(f"Unexpected OpenAI response: {data}") from exc
+        return choices
+
+    raise RuntimeError("Exhausted retries calling OpenAI API")
+
+
+def _as_messages(prompt: Union[str, List[Dict[str, str]]]) -> List[Dict[str, str]]:
+    # A bare string is shorthand for a single user turn.
+    if isinstance(prompt, str):
+        return [{"role": "user", "content": prompt}]
+    return prompt
+
+
+@functools.lru_cache(maxsize=512)
+def _cached_call(body: bytes, retries: int, initial_backoff: float) -> str:
+    # body is the sorted-key JSON of the payload: hashable, and identical for
+    # identical requests. Memoized in-process, backed by the disk cache.
+    key = hashlib.blake2b(body, digest_size=20).hexdigest()
+    content = _cache_get(key)
+    if content is None:
+        content = _post_chat(body, retries, initial_backoff)[0]
+        _cache_put(key, content)
+    return content
+
+
 def call_llm(
-    messages: List[Dict[str, str]],
+    messages: Union[str, List[Dict[str, str]]],
     model: str = "gpt-4.1-mini",
     max_tokens: int = 1200,
     temperature: float = 0.4,
     retries: int = 3,
     initial_backoff: float = 2.0,
+    cacheable: bool = False,
 ) -> str:
     """
     Low-level wrapper for OpenAI's chat completions endpoint using `requests`.
 
     `messages` is a standard OpenAI messages list:
       [{"role": "system", "content": "..."}, {"role": "user", "content": "..."}]
-    """
-    api_key = _get_api_key()
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-    }
+    or a plain string, sent as a single user message.
 
+    With temperature 0 (or cacheable=True) the response is memoized for the
+    process and stored in the on-disk cache under CACHE_DIR.
+    """
     payload: Dict[str, Any] = {
         "model": model,
-        "messages": messages,
+        "messages": _as_messages(messages),
         "max_tokens": max_tokens,
         "temperature": temperature,
     }
 
-    backoff = initial_backoff
+    if cacheable or temperature == 0:
+        return _cached_call(_json.dumps(payload, sort=True), retries, initial_backoff)
+    return _post_chat(_json.dumps(payload), retries, initial_backoff)[0]
 
-    for attempt in range(1, retries + 1):
-        resp = requests.post(API_URL, headers=headers, json=payload)
-        try:
-            resp.raise_for_status()
-        except requests.exceptions.HTTPError as exc:
-            status = resp.status_code
-            # Gentle handling for rate limits
-            if status in (429, 500, 502, 503, 504) and attempt < retries:
-                print(
-                    f"[llm_client] Transient error {status} on attempt "
-                    f"{attempt}/{retries}; backing off {backoff:.1f}s..."
+
+def call_llm_many(
+    message_lists: List[Union[str, List[Dict[str, str]]]],
+    n_per_prompt: int = 1,
+    model: str = "gpt-4.1-mini",
+    max_tokens: int = 1200,
+    temperature: float = 0.4,
+    retries: int = 3,
+    initial_backoff: float = 2.0,
+    max_workers: int = 8,
+) -> List[List[str]]:
+    """
+    Run several independent prompts and return their completions in order.
+
+    Each prompt is a single request asking for `n_per_prompt` choices via the
+    `n` parameter (K variants cost one round-trip, not K). Different prompts
+    are sent concurrently over the pooled session, at most `max_workers` at
+    a time. With n_per_prompt=1 this is just call_llm per prompt, caching
+    included.
+    """
+    if not message_lists:
+        return []
+
+    def _one(messages: Union[str, List[Dict[str, str]]]) -> List[str]:
+        if n_per_prompt == 1:
+            return [
+                call_llm(
+                    messages,
+                    model=model,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    retries=retries,
+                    initial_backoff=initial_backoff,
                 )
-                time.sleep(backoff)
-                backoff *= 2
-                continue
+            ]
+        payload: Dict[str, Any] = {
+            "model": model,
+            "messages": _as_messages(messages),
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "n": n_per_prompt,
+        }
+        return _post_chat(_json.dumps(payload), retries, initial_backoff)
 
-            # Re-raise for non-retryable or final failure
-            print(f"[llm_client] HTTP error from OpenAI: {status} {resp.text}")
-            raise exc
+    if len(message_lists) == 1:
+        return [_one(message_lists[0])]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(message_lists))) as pool:
+        return list(pool.map(_one, message_lists))
 
-        data = resp.json()
-        try:
-            return data["choices"][0]["message"]["content"]
-        except (KeyError, IndexError) as exc:  # pragma: no cover
-            raise RuntimeError(f"Unexpected OpenAI response: {data}") from exc
+
+def call_llm_stream(
+    messages: Union[str, List[Dict[str, str]]],
+    model: str = "gpt-4.1-mini",
+    max_tokens: int = 1200,
+    temperature: float = 0.4,
+    retries: int = 3,
+    initial_backoff: float = 2.0,
+) -> Iterator[str]:
+    """
+    Stream a completion, yielding text deltas as the server sends them.
+
+    Uses `"stream": true` (Server-Sent Events), so callers can write output
+    as it arrives instead of waiting for, and holding, the whole response.
+    Transient errors are retried only before the first delta is read. Not
+    cached; use call_llm for cacheable prompts.
+    """
+    body = _json.dumps({
+        "model": model,
+        "messages": _as_messages(messages),
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+        "stream": True,
+    })
+    session = _session()
+    from requests.exceptions import HTTPError
+
+    headers = _headers()
+
+    for attempt in range(1, retries + 1):
+        resp = session.post(API_URL, headers=headers, data=body, stream=True)
+        with resp:
+            try:
+                resp.raise_for_status()
+            except HTTPError as exc:
+                status = resp.status_code
+                if status in (429, 500, 502, 503, 504) and attempt < retries:
+                    _sleep_for_retry(resp, attempt, retries, base=initial_backoff)
+                    continue
+
+                print(f"[llm_client] HTTP error from OpenAI: {status} {_error_snippet(resp)}")
+                raise exc
+
+            for line in resp.iter_lines():
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    return
+                for choice in _json.loads(data).get("choices") or ():
+                    text = (choice.get("delta") or {}).get("content")
+                    if text:
+                        yield text
+            return
 
     raise RuntimeError("Exhausted retries calling OpenAI API")
+
+
+async def acall_llm(messages: Union[str, List[Dict[str, str]]], **kwargs: Any) -> str:
+    """
+    Awaitable `call_llm`, so independent prompts can run concurrently:
+
+        results = await asyncio.gather(*(acall_llm(m) for m in batches))
+
+    Each call runs on the default thread pool and shares the pooled session.
+    """
+    return await asyncio.to_thread(call_llm, messages, **kwargs)
@@ -15,13 +15,14 @@ class AgentConfig:
     output_dir: str
 
 
-@dataclass(init=False)
+@dataclass(slots=True, init=False)
 class ActionIntent:
     """
     Flexible intent container.
 
     Key point: this class MUST accept `metadata=` because the runner passes it.
-    Also: any extra kwargs are captured (and will not crash the workflow).
+    Also: any extra kwargs are captured in `metadata` (and will not crash the
+    workflow); read them from there, they are not mirrored as attributes.
     """
 
     name: str
@@ -37,14 +38,8 @@ class ActionIntent:
         self.metadata = dict(metadata or {})
 
         # absorb any unexpected fields safely
-        for k, v in kwargs.items():
-            self.metadata[k] = v
-
-        # optional convenience: expose keys as attributes too
-        # (won't overwrite existing attrs like 'name'/'metadata')
-        for k, v in self.metadata.items():
-            if not hasattr(self, k):
-                setattr(self, k, v)
+        if kwargs:
+            self.metadata.update(kwargs)
 
 
 __all__ = ["AgentConfig", "ActionIntent"]
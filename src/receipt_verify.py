@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-import json
 import os
 from typing import Any, Dict, Optional
 
+from . import _json
+
 
 def verify_receipt(
     receipt: Dict[str, Any],
@@ -47,7 +48,7 @@ def load_receipt_from_env() -> Dict[str, Any]:
         return {"issuer": "local", "verified": True, "note": "No receipt provided; local default used"}
 
     try:
-        obj = json.loads(raw)
+        obj = _json.loads(raw)
         if not isinstance(obj, dict):
             return {"issuer": "local", "verified": True, "note": "Receipt JSON was not an object; local default used"}
         return obj
@@ -1,15 +1,21 @@
 import base64
 import hashlib
+import hmac
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from functools import lru_cache, partial
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-from nacl.signing import VerifyKey
+if TYPE_CHECKING:  # pragma: no cover
+    from nacl.signing import VerifyKey
 
 
+@lru_cache(maxsize=256)
 def _parse_dt(s: str) -> datetime:
+    # Memoized: warrants in one batch usually share issued_at/expires_at.
     # Accept "Z"
     if s.endswith("Z"):
         s = s[:-1] + "+00:00"
@@ -21,15 +27,30 @@ def _utc_now() -> datetime:
 
 
 def _canonical_payload(warrant: Dict[str, Any]) -> bytes:
-    w = dict(warrant)
-    w.pop("signature", None)
+    w = {k: v for k, v in warrant.items() if k != "signature"}
+    # Stdlib json is the canonical (signed) form. orjson is not used here: it
+    # formats some floats differently (1e16 vs 1e+16, 1e-7 vs 1e-07) and
+    # NaN as null, which would break signatures from any stdlib signer.
     return json.dumps(w, separators=(",", ":"), sort_keys=True).encode("utf-8")
 
 
+def _lower(v: Any) -> str:
+    return v.lower() if isinstance(v, str) else ""
+
+
 def _sha256_hex(b: bytes) -> str:
     return hashlib.sha256(b).hexdigest()
 
 
+@lru_cache(maxsize=32)
+def _verify_key(pubkey_b64: str) -> "VerifyKey":
+    # Decoding and key setup happen once per issuer key, not once per warrant.
+    # nacl (libsodium) is imported on first verification, not at module import.
+    from nacl.signing import VerifyKey
+
+    return VerifyKey(base64.b64decode(pubkey_b64.strip()))
+
+
 @dataclass
 class WarrantDecision:
     ok: bool
@@ -45,48 +66,95 @@ def verify_warrant(
     observed_commit_sha: str,
     max_ttl_seconds: int = 900,
 ) -> WarrantDecision:
+    if not isinstance(warrant, dict):
+        return WarrantDecision(False, "Warrant must be an object.")
+    sig = warrant.get("signature")
+    if not isinstance(sig, dict):
+        sig = {}
+    alg = sig.get("alg")
+    if alg != "ed25519":
+        return WarrantDecision(False, f"Unsupported signature alg: {alg}")
+
+    raw_issued = warrant.get("issued_at")
+    raw_expires = warrant.get("expires_at")
+    if not isinstance(raw_issued, str) or not raw_issued:
+        return WarrantDecision(False, "Missing issued_at.")
+    if not isinstance(raw_expires, str) or not raw_expires:
+        return WarrantDecision(False, "Missing expires_at.")
+    try:
+        issued_at = _parse_dt(raw_issued)
+        expires_at = _parse_dt(raw_expires)
+    except ValueError as e:
+        return WarrantDecision(False, f"Invalid timestamp: {e}")
+    now = _utc_now()
+
+    if expires_at <= now:
+        return WarrantDecision(False, "Warrant expired.")
+    if issued_at > now:
+        return WarrantDecision(False, "Warrant issued in the future (clock skew).")
+
+    ttl = (expires_at - issued_at).total_seconds()
+    if ttl > max_ttl_seconds:
+        return WarrantDecision(False, f"TTL too long: {ttl}s > {max_ttl_seconds}s")
+
+    claims = warrant.get("claims")
+    if not isinstance(claims, dict):
+        claims = {}
+    if _lower(claims.get("repo")) != observed_repo.lower():
+        return WarrantDecision(False, "Repo claim mismatch.")
+    if _lower(claims.get("commit_sha")) != observed_commit_sha.lower():
+        return WarrantDecision(False, "Commit claim mismatch.")
+
+    policy = warrant.get("policy")
+    bundle_sha = _lower(policy.get("bundle_sha256")) if isinstance(policy, dict) else ""
+    if not bundle_sha or not hmac.compare_digest(
+        bundle_sha.encode("utf-8"), expected_bundle_sha256.lower().encode("utf-8")
+    ):
+        return WarrantDecision(False, "Policy bundle hash mismatch (pinning failed).")
+
+    # Every cheap dict check has passed; only now canonicalize and verify.
+    payload = _canonical_payload(warrant)
+    payload_sha = _sha256_hex(payload)
+
+    from nacl.exceptions import CryptoError
+
+    # Only decoding and signature verification can legitimately raise here
+    # (bad base64, malformed key, BadSignatureError).
     try:
-        sig = warrant.get("signature") or {}
-        alg = sig.get("alg")
-        if alg != "ed25519":
-            return WarrantDecision(False, f"Unsupported signature alg: {alg}")
-
-        issued_at = _parse_dt(warrant["issued_at"])
-        expires_at = _parse_dt(warrant["expires_at"])
-        now = _utc_now()
-
-        if expires_at <= now:
-            return WarrantDecision(False, "Warrant expired.")
-        if issued_at > now:
-            return WarrantDecision(False, "Warrant issued in the future (clock skew).")
-
-        ttl = (expires_at - issued_at).total_seconds()
-        if ttl > max_ttl_seconds:
-            return WarrantDecision(False, f"TTL too long: {ttl}s > {max_ttl_seconds}s")
-
-        policy = warrant.get("policy") or {}
-        bundle_sha = (policy.get("bundle_sha256") or "").lower()
-        if not bundle_sha or bundle_sha != expected_bundle_sha256.lower():
-            return WarrantDecision(False, "Policy bundle hash mismatch (pinning failed).")
-
-        claims = warrant.get("claims") or {}
-        w_repo = (claims.get("repo") or "").lower()
-        w_sha = (claims.get("commit_sha") or "").lower()
-        if w_repo != observed_repo.lower():
-            return WarrantDecision(False, "Repo claim mismatch.")
-        if w_sha != observed_commit_sha.lower():
-            return WarrantDecision(False, "Commit claim mismatch.")
-
-        payload = _canonical_payload(warrant)
-        payload_sha = _sha256_hex(payload)
-
-        sig_b64 = sig.get("sig_b64") or ""
-        sig_bytes = base64.b64decode(sig_b64)
-
-        pub = base64.b64decode(issuer_pubkey_b64.strip())
-        vk = VerifyKey(pub)
+        sig_bytes = base64.b64decode(sig.get("sig_b64") or "")
+        vk = _verify_key(issuer_pubkey_b64)
         vk.verify(payload, sig_bytes)
-
-        return WarrantDecision(True, "OK", payload_sha256=payload_sha)
-    except Exception as e:
+    except (CryptoError, ValueError, TypeError) as e:
         return WarrantDecision(False, f"Verification error: {e}")
+
+    return WarrantDecision(True, "OK", payload_sha256=payload_sha)
+
+
+def verify_warrants(
+    warrants: List[Dict[str, Any]],
+    issuer_pubkey_b64: str,
+    expected_bundle_sha256: str,
+    observed_repo: str,
+    observed_commit_sha: str,
+    max_ttl_seconds: int = 900,
+    max_workers: Optional[int] = None,
+) -> List[WarrantDecision]:
+    """
+    Verify a batch of warrants from one issuer; decisions keep input order.
+
+    libsodium releases the GIL during Ed25519 verification, so the checks
+    run on a thread pool.
+    """
+    check = partial(
+        verify_warrant,
+        issuer_pubkey_b64=issuer_pubkey_b64,
+        expected_bundle_sha256=expected_bundle_sha256,
+        observed_repo=observed_repo,
+        observed_commit_sha=observed_commit_sha,
+        max_ttl_seconds=max_ttl_seconds,
+    )
+    if len(warrants) <= 1:
+        return [check(w) for w in warrants]
+    workers = max_workers or min(16, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(check, warrants))
@@ -0,0 +1,32 @@
+from src import _json
+
+
+def test_dumps_is_utf8_bytes_and_round_trips():
+    obj = {"b": "Zoë", "a": [1, None, True]}
+    out = _json.dumps(obj, sort=True)
+    assert isinstance(out, bytes)
+    assert out == '{"a":[1,null,true],"b":"Zoë"}'.encode("utf-8")
+    assert _json.loads(out) == obj
+
+
+def test_dumps_indent():
+    assert _json.dumps({"a": 1}, indent=True) == b'{\n  "a": 1\n}'
+
+
+def test_loads_many_handles_multiline_and_junk():
+    text = '{"a": 1}\n{\n  "b": [2,\n 3]\n}\n\nnot json\n{"c": 4} {"d": 5}\n'
+    got = _json.loads_many(text, lambda line: {"raw": line})
+    assert got == [{"a": 1}, {"b": [2, 3]}, {"raw": "not json"}, {"raw": '{"c": 4} {"d": 5}'}]
+
+
+def test_loads_many_keeps_prose_lines_whole():
+    text = '1. First item\n2. Second item\ntrue story\n"quoted" text\n42\n{"ok": true}\n'
+    got = _json.loads_many(text, lambda line: {"raw": line})
+    assert got == [
+        {"raw": "1. First item"},
+        {"raw": "2. Second item"},
+        {"raw": "true story"},
+        {"raw": '"quoted" text'},
+        {"raw": "42"},
+        {"ok": True},
+    ]
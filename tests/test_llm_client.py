@@ -0,0 +1,167 @@
+import asyncio
+import json
+import os
+
+import pytest
+import requests
+
+from src import llm_client
+
+
+class FakeResponse:
+    def __init__(self, status_code, content="", headers=None, choices=None, lines=()):
+        self.status_code = status_code
+        self.headers = headers or {}
+        choices = [content] if choices is None else choices
+        self.content = json.dumps(
+            {"choices": [{"message": {"content": c}} for c in choices]}
+        ).encode("utf-8")
+        self.lines = [line.encode("utf-8") for line in lines]
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error", response=self)
+
+    def iter_content(self, chunk_size):
+        yield self.content[:chunk_size]
+
+    def iter_lines(self):
+        return iter(self.lines)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FakeSession:
+    def __init__(self, responses, respond=None):
+        self.responses = list(responses)
+        self.respond = respond
+        self.bodies = []
+
+    @property
+    def posts(self):
+        return len(self.bodies)
+
+    def post(self, url, headers=None, data=None, stream=False):
+        body = json.loads(data)
+        self.bodies.append(body)
+        if self.respond is not None:
+            return self.respond(body)
+        return self.responses.pop(0)
+
+
+def _clear_caches():
+    for fn in (llm_client._get_api_key, llm_client._headers, llm_client._cached_call, llm_client._prune_cache):
+        fn.cache_clear()
+
+
+@pytest.fixture
+def fake(monkeypatch, tmp_path):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(llm_client, "CACHE_DIR", tmp_path)
+    sleeps = []
+    monkeypatch.setattr(llm_client.time, "sleep", sleeps.append)
+    _clear_caches()
+
+    def install(*responses, respond=None):
+        session = FakeSession(responses, respond)
+        monkeypatch.setattr(llm_client, "_session", lambda: session)
+        return session
+
+    install.sleeps = sleeps
+    yield install
+    _clear_caches()
+
+
+def test_retry_after_is_honoured(fake):
+    session = fake(
+        FakeResponse(429, headers={"Retry-After": "3"}),
+        FakeResponse(200, "hello"),
+    )
+    assert llm_client.call_llm("hi") == "hello"
+    assert session.posts == 2
+    assert fake.sleeps == [3.0]
+
+
+def test_deterministic_calls_hit_the_disk_cache(fake, tmp_path):
+    session = fake(FakeResponse(200, "cached"))
+    assert llm_client.call_llm("hi", temperature=0) == "cached"
+    # Drop the in-process memo so the second call has to go to disk.
+    llm_client._cached_call.cache_clear()
+    assert llm_client.call_llm("hi", temperature=0) == "cached"
+    assert session.posts == 1
+    assert len(list(tmp_path.glob("*.txt"))) == 1
+
+
+def _age(path):
+    past = os.path.getmtime(path) - llm_client.CACHE_TTL_SECONDS - 60
+    os.utime(path, (past, past))
+
+
+def test_expired_cache_entries_are_deleted(fake, tmp_path):
+    orphan = tmp_path / ("0" * 40 + ".txt")
+    orphan.write_text("never read again", encoding="utf-8")
+    _age(orphan)
+    session = fake(FakeResponse(200, "old"), FakeResponse(200, "new"))
+
+    assert llm_client.call_llm("hi", temperature=0) == "old"
+    assert not orphan.exists()
+
+    (entry,) = tmp_path.glob("*.txt")
+    _age(entry)
+    llm_client._cached_call.cache_clear()
+    assert llm_client.call_llm("hi", temperature=0) == "new"
+    assert session.posts == 2
+    assert entry.read_text(encoding="utf-8") == "new"
+
+
+def _sse(*deltas):
+    lines = [": keep-alive", ""]
+    for text in deltas:
+        lines.append("data: " + json.dumps({"choices": [{"delta": {"content": text}}]}))
+    return lines + ["data: [DONE]", "data: " + json.dumps({"choices": [{"delta": {"content": "after"}}]})]
+
+
+def test_stream_yields_deltas_until_done(fake):
+    session = fake(FakeResponse(200, lines=_sse("Hel", "lo")))
+    assert list(llm_client.call_llm_stream("hi")) == ["Hel", "lo"]
+    assert session.bodies[0]["stream"] is True
+
+
+def test_stream_retries_before_first_delta(fake):
+    session = fake(
+        FakeResponse(503, headers={"Retry-After": "1"}),
+        FakeResponse(200, lines=_sse("ok")),
+    )
+    assert list(llm_client.call_llm_stream("hi")) == ["ok"]
+    assert session.posts == 2
+    assert fake.sleeps == [1.0]
+
+
+def _echo(body):
+    # One choice per requested variant, tagged with the prompt it answers.
+    prompt = body["messages"][-1]["content"]
+    return FakeResponse(200, choices=[f"{prompt}-{i}" for i in range(body.get("n", 1))])
+
+
+def test_call_llm_many_returns_every_choice_in_order(fake):
+    session = fake(respond=_echo)
+    out = llm_client.call_llm_many(["a", "b"], n_per_prompt=3)
+    assert out == [["a-0", "a-1", "a-2"], ["b-0", "b-1", "b-2"]]
+    assert session.posts == 2
+    assert all(body["n"] == 3 for body in session.bodies)
+
+
+def test_acall_llm_gathers_in_prompt_order(fake):
+    fake(respond=_echo)
+
+    async def main():
+        return await asyncio.gather(*(llm_client.acall_llm(p) for p in ("x", "y")))
+
+    assert asyncio.run(main()) == ["x-0", "y-0"]
@@ -0,0 +1,66 @@
+import importlib.util
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+SCAN_PATH = Path(__file__).resolve().parents[1] / "scripts" / "_impl" / "scan_no_stegid.py"
+
+# Built by concatenation so this file does not trip the scanner itself.
+REPO = "stegverse-labs/" + "stegid"
+REPO_CASED = "StegVerse-Labs/" + "StegID"
+
+FILES = {
+    "a.py": "import stegid\nx = 1\n  from StegID.receipts import verify\n",
+    "docs/README.md": f"Do not use https://github.com/{REPO_CASED}.git here.\n",
+    "notes.txt": f"\n\nimport stegid  # see {REPO}\n",
+    "Dockerfile": f"RUN pip install git+https://github.com/{REPO}\n",
+    "clean.py": "import stegidx\nstegid = None\n",
+    # Per-line patterns must not match across a line break.
+    "multiline.py": 'x = """\nimport\nstegid\n"""\n',
+    # Over the 2 MiB MAX_SCAN_BYTES cap: skipped by every engine.
+    "big.md": "import stegid\n" + "x" * (2 * 1024 * 1024),
+    # Allowlisted path and an unscanned extension: never reported.
+    "src/sv_receipts.py": "import stegid\n",
+    "logo.png": "import stegid\n",
+}
+
+EXPECTED = [
+    f"- Dockerfile:1 [stegid_repo] RUN pip install git+https://github.com/{REPO}",
+    "- a.py:1 [stegid_import] import stegid",
+    "- a.py:3 [stegid_import] from StegID.receipts import verify",
+    f"- docs/README.md:1 [stegid_repo] Do not use https://github.com/{REPO_CASED}.git here.",
+    f"- notes.txt:3 [stegid_import] import stegid  # see {REPO}",
+    f"- notes.txt:3 [stegid_repo] import stegid  # see {REPO}",
+]
+
+
+def _load_scanner():
+    spec = importlib.util.spec_from_file_location("scan_no_stegid", SCAN_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture
+def planted_repo(tmp_path, monkeypatch):
+    for rel, text in FILES.items():
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+    subprocess.run(["git", "add", "-A"], cwd=tmp_path, check=True)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_engines_agree_on_planted_violations(planted_repo, monkeypatch):
+    scanner = _load_scanner()
+    assert scanner.python_violations() == EXPECTED
+    if scanner.HS_DB is not None:
+        monkeypatch.setattr(scanner, "HS_DB", None)
+        assert scanner.python_violations() == EXPECTED
+    assert scanner.git_grep_violations() == EXPECTED
+    if shutil.which("rg"):
+        assert scanner.ripgrep_violations() == EXPECTED
@@ -0,0 +1,79 @@
+import base64
+import importlib.util
+import json
+import os
+from pathlib import Path
+
+from nacl.signing import SigningKey
+
+from src.warrant_verify import verify_warrant, verify_warrants
+
+MINT_PATH = Path(__file__).resolve().parents[1] / "scripts" / "mint_warrant.py"
+
+
+def _load_minter():
+    spec = importlib.util.spec_from_file_location("mint_warrant", MINT_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _mint(monkeypatch, capsys):
+    seed = os.urandom(32)
+    pub_b64 = base64.b64encode(bytes(SigningKey(seed).verify_key)).decode("utf-8")
+
+    monkeypatch.setenv("WARRANT_ISSUER", "tv.warrant.test")
+    monkeypatch.setenv("WARRANT_PUBLIC_KEY_ID", "tv.warrant.test.ed25519.001")
+    monkeypatch.setenv("WARRANT_ED25519_PRIVATE_B64", base64.b64encode(seed).decode("utf-8"))
+    monkeypatch.setenv("AGENT_NAME", "GrantFinder-001")
+    monkeypatch.setenv("TV_POLICY_BUNDLE_SHA256", "ab" * 32)
+    monkeypatch.setenv("GITHUB_REPOSITORY", "StegVerse-Labs/StegAgents")
+    monkeypatch.setenv("GITHUB_SHA", "0123abcd")
+    monkeypatch.setenv("GITHUB_ACTOR", "Zoë")
+
+    _load_minter().main()
+    out = capsys.readouterr().out
+    return json.loads(out.split("\n# ", 1)[0]), pub_b64
+
+
+EXPECTED = dict(
+    expected_bundle_sha256="ab" * 32,
+    observed_repo="StegVerse-Labs/StegAgents",
+    observed_commit_sha="0123abcd",
+)
+
+
+def test_minted_warrant_verifies(monkeypatch, capsys):
+    warrant, pub_b64 = _mint(monkeypatch, capsys)
+    decision = verify_warrant(warrant=warrant, issuer_pubkey_b64=pub_b64, **EXPECTED)
+    assert decision.ok, decision.reason
+
+
+def test_verify_warrants_keeps_order(monkeypatch, capsys):
+    warrant, pub_b64 = _mint(monkeypatch, capsys)
+    tampered = dict(warrant, warrant_id="forged")
+    decisions = verify_warrants([warrant, tampered, warrant], issuer_pubkey_b64=pub_b64, **EXPECTED)
+    assert [d.ok for d in decisions] == [True, False, True]
+
+
+def test_malformed_warrants_are_rejected_not_raised(monkeypatch, capsys):
+    warrant, pub_b64 = _mint(monkeypatch, capsys)
+    missing = {k: v for k, v in warrant.items() if k != "issued_at"}
+    bad_sig = dict(warrant, signature=dict(warrant["signature"], sig_b64="!!!"))
+    for w in (missing, bad_sig, dict(warrant, claims=None), [], None):
+        assert not verify_warrant(warrant=w, issuer_pubkey_b64=pub_b64, **EXPECTED).ok
+
+
+def test_float_claims_round_trip_with_stdlib_signer(monkeypatch, capsys):
+    # Floats are where orjson and stdlib json disagree (1e16 vs 1e+16).
+    warrant, _ = _mint(monkeypatch, capsys)
+    key = SigningKey(os.urandom(32))
+    pub_b64 = base64.b64encode(bytes(key.verify_key)).decode("utf-8")
+    warrant["claims"] = dict(warrant["claims"], budget=1e16, ratio=1e-7)
+    body = {k: v for k, v in warrant.items() if k != "signature"}
+    payload = json.dumps(body, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    assert _load_minter().canonical_payload(warrant) == payload
+    sig = base64.b64encode(key.sign(payload).signature).decode("utf-8")
+    warrant["signature"] = dict(warrant["signature"], sig_b64=sig)
+    decision = verify_warrant(warrant=warrant, issuer_pubkey_b64=pub_b64, **EXPECTED)
+    assert decision.ok, decision.reason